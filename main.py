@@ -3,16 +3,35 @@ from tkinter import messagebox, ttk
 import datetime
 from datetime import timedelta
 import json
-from collections import defaultdict
+import itertools
+import sys
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+try:
+    import orjson  # Optional, much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
 
 
 class FinanceTracker:
     """A class to track personal finances, including income and expenses."""
 
-    def __init__(self, filename="transactions.json"):
-        self.transactions = []  # List to store all transactions
+    def __init__(self, filename="transactions.json", autosave=True):
+        self.transactions = []  # List to store all transactions, kept sorted by date
+        self._date_keys = []  # Date of each transaction, parallel to self.transactions for bisecting
+        self._by_category = {}  # Category -> (dates, transactions), both sorted by date
+        self._by_id = {}  # Stable transaction ID -> transaction
+        self._ids = itertools.count()
+        self._filter_cache = {}  # (other_category, any_type) -> generated filter function
+        self._total_income = 0.0  # Running totals, kept in sync on add/delete
+        self._total_expense = 0.0
+        self._income_count = 0  # Transactions behind each running total
+        self._expense_count = 0
         self.predefined_categories = ["Salary", "Groceries", "Furniture", "Rent", "Recreation"]
         self.filename = filename
+        self.autosave = autosave  # Save after every change; otherwise call flush()
+        self.dirty = False
         self.load_transactions()
 
     def add_transaction(self, amount, category, date, transaction_type):
@@ -20,101 +39,226 @@ class FinanceTracker:
         transaction = {
             "amount": amount,
             "category": category,
-            "date": date.isoformat(),
+            "date": date,
             "type": transaction_type,
         }
-        self.transactions.append(transaction)
-        self.save_transactions()
-
-    def delete_transaction(self, index):
-        """Deletes a transaction at a given index."""
-        if 0 <= index < len(self.transactions):
-            del self.transactions[index]
-            self.save_transactions()
+        self._prepare_transaction(transaction)
+        self._update_running_totals(transaction, 1)
+        position = bisect_right(self._date_keys, transaction["date"])
+        self._date_keys.insert(position, transaction["date"])
+        self.transactions.insert(position, transaction)
+        self._by_id[transaction["_id"]] = transaction
+        dates, transactions = self._by_category.setdefault(transaction["category"], ([], []))
+        position = bisect_right(dates, transaction["date"])
+        dates.insert(position, transaction["date"])
+        transactions.insert(position, transaction)
+        self._mark_dirty()
+
+    def delete_transaction(self, transaction_id):
+        """Deletes the transaction with the given ID."""
+        transaction = self._by_id.pop(transaction_id, None)
+        if transaction is not None:
+            self._update_running_totals(transaction, -1)
+            self._remove_sorted(self._date_keys, self.transactions, transaction)
+
+            dates, transactions = self._by_category[transaction["category"]]
+            self._remove_sorted(dates, transactions, transaction)
+            if not transactions:
+                del self._by_category[transaction["category"]]
+            self._mark_dirty()
+
+    @staticmethod
+    def _remove_sorted(dates, transactions, transaction):
+        """Removes a transaction from a date-sorted list and its parallel list of dates."""
+        position = bisect_left(dates, transaction["date"])
+        while transactions[position] is not transaction:
+            position += 1
+        del dates[position]
+        del transactions[position]
 
     def filter_transactions(self, category, transaction_type, start_date, end_date):
         """Filters transactions by category, type, and date range."""
-        filtered = self.transactions
-
-        # Filter by category
-        if category == "Other":
-            filtered = [t for t in filtered if t["category"] not in self.predefined_categories]
-        elif category and category != "All":
-            filtered = [t for t in filtered if t["category"] == category]
-
-        # Filter by transaction type
-        if transaction_type and transaction_type != "All":
-            filtered = [t for t in filtered if t["type"] == transaction_type]
+        other_category = category == "Other"
+        any_type = not transaction_type or transaction_type == "All"
+        predefined = frozenset(self.predefined_categories)
 
-        # Filter by date range
-        if start_date:
-            filtered = [t for t in filtered if datetime.date.fromisoformat(t["date"]) >= start_date]
-        if end_date:
-            filtered = [t for t in filtered if datetime.date.fromisoformat(t["date"]) <= end_date]
-
-        return filtered
+        if category and category not in ("All", "Other"):
+            # Only visit transactions in the selected category
+            dates, candidates = self._by_category.get(category, ([], []))
+        else:
+            dates, candidates = self._date_keys, self.transactions
+
+        # Candidates are sorted by date, so the date range is a contiguous slice
+        low = bisect_left(dates, start_date) if start_date else 0
+        high = bisect_right(dates, end_date) if end_date else len(candidates)
+
+        # Single pass with only the checks this combination of filters needs
+        return self._specialized_filter(other_category, any_type)(candidates[low:high], transaction_type, predefined)
+
+    def _specialized_filter(self, other_category, any_type):
+        """Returns a filter function generated for one combination of filters."""
+        key = (other_category, any_type)
+        if key not in self._filter_cache:
+            conditions = []
+            if other_category:
+                conditions.append('t["category"] not in predefined')
+            if not any_type:
+                conditions.append('t["type"] == transaction_type')
+            if conditions:
+                body = f"[t for t in candidates if {' and '.join(conditions)}]"
+            else:
+                body = "candidates"
+            source = f"def filter_candidates(candidates, transaction_type, predefined):\n    return {body}\n"
+            namespace = {}
+            exec(compile(source, "<filter_transactions>", "exec"), namespace)
+            self._filter_cache[key] = namespace["filter_candidates"]
+        return self._filter_cache[key]
 
     def calculate_totals(self, transactions):
         """Calculates the total income and total expenses for the given transactions."""
-        total_income = sum(t["amount"] for t in transactions if t["type"] == "Income")
-        total_expense = sum(t["amount"] for t in transactions if t["type"] == "Expense")
+        if transactions is self.transactions:
+            # Totals over every transaction are kept up to date on add/delete
+            return self._total_income, self._total_expense
+        total_income = total_expense = 0.0
+        for t in transactions:
+            if t["type"] == "Income":
+                total_income += t["amount"]
+            elif t["type"] == "Expense":
+                total_expense += t["amount"]
         return total_income, total_expense
 
     def calculate_category_breakdown(self, transactions):
         """Calculates the percentage breakdown for income and expense categories."""
-        income_totals = defaultdict(float)
-        expense_totals = defaultdict(float)
+        _, _, income_percentages, expense_percentages = self.summarize(transactions)
+        return income_percentages, expense_percentages
+
+    def summarize(self, transactions):
+        """Calculates totals and category percentage breakdowns in a single pass.
 
-        # Sum amounts by category
+        Returns (total_income, total_expense, income_percentages, expense_percentages).
+        """
+        total_income = total_expense = 0.0
+        income_totals = {}
+        expense_totals = {}
+
+        # Sum amounts overall and by category, reading each field once per transaction
         for t in transactions:
-            if t["type"] == "Income":
-                income_totals[t["category"]] += t["amount"]
-            elif t["type"] == "Expense":
-                expense_totals[t["category"]] += t["amount"]
+            transaction_type = t["type"]
+            amount = t["amount"]
+            if transaction_type == "Income":
+                total_income += amount
+                category = t["category"]
+                income_totals[category] = income_totals.get(category, 0.0) + amount
+            elif transaction_type == "Expense":
+                total_expense += amount
+                category = t["category"]
+                expense_totals[category] = expense_totals.get(category, 0.0) + amount
 
         # Calculate income percentages
-        total_income = sum(income_totals.values())
         income_percentages = {
             category: (amount / total_income * 100) if total_income > 0 else 0
             for category, amount in income_totals.items()
         }
 
         # Calculate expense percentages
-        total_expense = sum(expense_totals.values())
         expense_percentages = {
             category: (amount / total_expense * 100) if total_expense > 0 else 0
             for category, amount in expense_totals.items()
         }
 
-        return income_percentages, expense_percentages
+        return total_income, total_expense, income_percentages, expense_percentages
 
     def view_balance(self):
         """Calculates and returns the current balance."""
-        income = sum(t["amount"] for t in self.transactions if t["type"] == "Income")
-        expenses = sum(t["amount"] for t in self.transactions if t["type"] == "Expense")
-        return income - expenses
+        return self._total_income - self._total_expense
 
     def save_transactions(self):
         """Saves transactions to a JSON file."""
-        with open(self.filename, "w") as file:
-            json.dump(self.transactions, file, indent=4)
+        # Cached fields (prefixed with an underscore) are not persisted
+        records = [{k: v for k, v in t.items() if not k.startswith("_")} for t in self.transactions]
+        if orjson:
+            with open(self.filename, "wb") as file:
+                file.write(orjson.dumps(records))
+        else:
+            with open(self.filename, "w") as file:
+                json.dump(records, file, separators=(",", ":"), default=datetime.date.isoformat)
+        self.dirty = False
+
+    def flush(self):
+        """Saves transactions if there are unsaved changes."""
+        if self.dirty:
+            self.save_transactions()
 
     def load_transactions(self):
         """Loads transactions from a JSON file."""
         try:
-            with open(self.filename, "r") as file:
-                self.transactions = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(self.filename, "rb") as file:
+                data = file.read()
+            self.transactions = orjson.loads(data) if orjson else json.loads(data)
+        except (FileNotFoundError, json.JSONDecodeError):  # orjson.JSONDecodeError is a subclass
             self.transactions = []
 
+        self._total_income = self._total_expense = 0.0
+        self._income_count = self._expense_count = 0
+        # Dates are stored as ISO strings but kept as datetime.date in memory
+        for t in self.transactions:
+            t["date"] = datetime.date.fromisoformat(t["date"])
+            self._prepare_transaction(t)
+            self._update_running_totals(t, 1)
+        self.transactions.sort(key=lambda t: t["date"])
+        self._date_keys = [t["date"] for t in self.transactions]
+        self._by_id = {t["_id"]: t for t in self.transactions}
+        self._by_category = {}
+        for t in self.transactions:
+            dates, transactions = self._by_category.setdefault(t["category"], ([], []))
+            dates.append(t["date"])
+            transactions.append(t)
+
+    def _prepare_transaction(self, transaction):
+        """Attaches cached, derived fields to a transaction."""
+        transaction["_id"] = next(self._ids)
+        # Interned strings make the many category/type comparisons and lookups cheaper
+        transaction["category"] = sys.intern(transaction["category"])
+        transaction["type"] = sys.intern(transaction["type"])
+        # Values shown in the transaction list; the date is displayed as MM/DD/YYYY
+        transaction["_row"] = (
+            f"${transaction['amount']:.2f}",
+            transaction["category"],
+            transaction["date"].strftime("%m/%d/%Y"),
+            transaction["type"],
+        )
+
+    def _mark_dirty(self):
+        """Records an unsaved change, saving immediately when autosave is on."""
+        self.dirty = True
+        if self.autosave:
+            self.save_transactions()
+
+    def _update_running_totals(self, transaction, sign):
+        """Adds (sign=1) or removes (sign=-1) a transaction from the running totals."""
+        # Once the last transaction of a type is gone, reset its total so float error cannot linger
+        if transaction["type"] == "Income":
+            self._income_count += sign
+            self._total_income = self._total_income + sign * transaction["amount"] if self._income_count else 0.0
+        elif transaction["type"] == "Expense":
+            self._expense_count += sign
+            self._total_expense = self._total_expense + sign * transaction["amount"] if self._expense_count else 0.0
+
 
 class FinanceTrackerApp:
     """GUI application for Finance Tracker Pro."""
 
+    SAVE_DELAY_MS = 500  # Changes within this window are written to disk together
+    PAGE_SIZE = 200  # Rows inserted into the transaction list at a time
+
     def __init__(self, root):
-        self.tracker = FinanceTracker()
+        self.tracker = FinanceTracker(autosave=False)
         self.root = root
         self.root.title("Finance Tracker Pro")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._save_job = None
+        self._in_batch = False  # See batch_changes()
+        self._batch_changed = False
 
         # Set background color
         self.root.configure(bg="#f0f8ff")
@@ -247,8 +391,14 @@ class FinanceTrackerApp:
         )
         self.balance_label.pack()
 
+        self.listed_transactions = []  # Transactions backing the list, rendered a page at a time
+        self.rendered_count = 0
         self.transaction_list = ttk.Treeview(
-            self.output_frame, columns=("Amount", "Category", "Date", "Type"), show="headings", height=10
+            self.output_frame,
+            columns=("Amount", "Category", "Date", "Type"),
+            show="headings",
+            height=10,
+            yscrollcommand=self.on_list_scroll,
         )
         self.transaction_list.heading("Amount", text="Amount")
         self.transaction_list.heading("Category", text="Category")
@@ -342,8 +492,7 @@ class FinanceTrackerApp:
 
             transaction_type = self.type_var.get()
             self.tracker.add_transaction(amount, category, date, transaction_type)
-            self.update_balance()
-            self.show_all_transactions()
+            self.transactions_changed()
 
             # Clear inputs
             self.amount_entry.delete(0, tk.END)
@@ -377,6 +526,9 @@ class FinanceTrackerApp:
         if not date_str:
             return None
         try:
+            if len(date_str) == 10 and date_str[2] == date_str[5] == "/":
+                # Fast path for zero-padded MM/DD/YYYY: slice instead of split
+                return datetime.date(int(date_str[6:]), int(date_str[:2]), int(date_str[3:5]))
             month, day, year = map(int, date_str.split("/"))
             return datetime.date(year, month, day)
         except ValueError:
@@ -385,14 +537,15 @@ class FinanceTrackerApp:
 
     def generate_summary(self):
         """Generates a summary for the filtered period."""
-        total_income, total_expense = self.tracker.calculate_totals(self.filtered_transactions)
-        income_breakdown, expense_breakdown = self.tracker.calculate_category_breakdown(self.filtered_transactions)
+        total_income, total_expense, income_breakdown, expense_breakdown = self.tracker.summarize(
+            self.filtered_transactions
+        )
 
         summary_text = (
             f"Summary for Selected Period:\n"
-            f"Total Income: ${total_income:.2f}\n"
-            f"Total Expenses: ${total_expense:.2f}\n"
-            f"Net Gain/Loss: ${total_income - total_expense:.2f}\n\n"
+            f"Total Income: {self.format_amount(total_income)}\n"
+            f"Total Expenses: {self.format_amount(total_expense)}\n"
+            f"Net Gain/Loss: {self.format_amount(total_income - total_expense)}\n\n"
             f"Income Breakdown:\n"
         )
 
@@ -412,11 +565,54 @@ class FinanceTrackerApp:
             messagebox.showerror("Error", "No transaction selected!")
             return
 
-        index = int(selected_item[0])  # Use the row ID as the index
-        self.tracker.delete_transaction(index)
+        # Row IDs are the transactions' stable IDs
+        with self.batch_changes():
+            for item in selected_item:
+                self.tracker.delete_transaction(int(item))
+                self.transactions_changed()
+
+    def transactions_changed(self):
+        """Saves and redisplays transactions after a change, once per batch."""
+        if self._in_batch:
+            self._batch_changed = True
+            return
+        self.schedule_save()
         self.update_balance()
         self.show_all_transactions()
 
+    @contextmanager
+    def batch_changes(self):
+        """Defers the refresh from transactions_changed() until the block exits."""
+        if self._in_batch:
+            yield
+            return
+        self._in_batch = True
+        self._batch_changed = False
+        try:
+            yield
+        finally:
+            self._in_batch = False
+            if self._batch_changed:
+                self.transactions_changed()
+
+    def schedule_save(self):
+        """Saves pending changes once no further changes arrive for SAVE_DELAY_MS."""
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(self.SAVE_DELAY_MS, self.save_pending)
+
+    def save_pending(self):
+        """Writes any unsaved changes to disk."""
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self._save_job = None
+        self.tracker.flush()
+
+    def on_close(self):
+        """Saves pending changes before closing the window."""
+        self.save_pending()
+        self.root.destroy()
+
     def filter_last_week(self):
         """Filters transactions for the last week."""
         end_date = datetime.date.today()
@@ -445,31 +641,45 @@ class FinanceTrackerApp:
 
     def update_transaction_list(self, transactions):
         """Updates the transaction list."""
-        for row in self.transaction_list.get_children():
-            self.transaction_list.delete(row)
-
-        for i, t in enumerate(transactions):
+        children = self.transaction_list.get_children()
+        if children:
+            self.transaction_list.delete(*children)
+
+        self.listed_transactions = transactions
+        self.rendered_count = 0
+        self.render_next_page()
+
+    def render_next_page(self):
+        """Inserts the next page of transactions into the transaction list."""
+        end = min(self.rendered_count + self.PAGE_SIZE, len(self.listed_transactions))
+        for t in self.listed_transactions[self.rendered_count:end]:
             self.transaction_list.insert(
                 "", "end",
-                iid=i,  # Use the index as the unique identifier
-                values=(
-                    f"${t['amount']:.2f}",
-                    t["category"],
-                    datetime.date.fromisoformat(t["date"]).strftime("%m/%d/%Y"),  # Display date in MM/DD/YYYY
-                    t["type"],
-                ),
+                iid=t["_id"],  # Use the transaction's stable ID as the unique identifier
+                values=t["_row"],
             )
+        self.rendered_count = end
+
+    def on_list_scroll(self, first, last):
+        """Renders more rows once the transaction list is scrolled to the bottom."""
+        if float(last) >= 1.0 and self.rendered_count < len(self.listed_transactions):
+            self.render_next_page()
 
     def update_totals(self, transactions):
         """Updates the total income and expense labels."""
         total_income, total_expense = self.tracker.calculate_totals(transactions)
-        self.total_income_label.config(text=f"Income over Selected Period: ${total_income:.2f}")
-        self.total_expense_label.config(text=f"Expenses over Selected Period: ${total_expense:.2f}")
+        self.total_income_label.config(text=f"Income over Selected Period: {self.format_amount(total_income)}")
+        self.total_expense_label.config(text=f"Expenses over Selected Period: {self.format_amount(total_expense)}")
 
     def update_balance(self):
         """Updates the balance label."""
         balance = self.tracker.view_balance()
-        self.balance_label.config(text=f"Current Balance: ${balance:.2f}")
+        self.balance_label.config(text=f"Current Balance: {self.format_amount(balance)}")
+
+    @staticmethod
+    def format_amount(amount):
+        """Formats an amount as dollars, without showing float error as $-0.00."""
+        return f"${round(amount, 2) + 0.0:.2f}"
 
     def show_all_transactions(self):
         """Displays all transactions without any filters."""